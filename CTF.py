@@ -1,4 +1,6 @@
 import asyncio
+import functools
+import hashlib
 import json
 import os
 import random
@@ -7,15 +9,23 @@ import secrets
 import signal
 import string
 import sys
+import time
+from collections import defaultdict
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional, Set
+from typing import Optional, Set, Tuple
 
+import aiohttp
 import discord
-import requests
+import msgpack
 from discord import app_commands
 from discord.ext import commands, tasks
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:  # Fall back to stdlib json on minimal installs
+    orjson = None
+
 # Load environment variables
 load_dotenv()
 
@@ -40,6 +50,16 @@ DEFAULT_CTF_CREDENTIALS = {
     "email": "Not-Set@gmail.com"
 }
 
+def default_guild_config() -> dict:
+    """Fresh per-guild config template; defaultdict factory for guild_configs"""
+    return {
+        "setup_complete": False,
+        "channel_id": None,
+        "settings": DEFAULT_CONFIG.copy(),
+        "ctf_channels": {},
+        "ctf_credentials": DEFAULT_CTF_CREDENTIALS.copy()
+    }
+
 # Category names
 CTF_CATEGORY_NAME = "🚩 Active CTFs"
 ARCHIVE_CATEGORY_NAME = "📁 Archived CTFs"
@@ -48,108 +68,164 @@ ARCHIVE_CATEGORY_NAME = "📁 Archived CTFs"
 # Data Management Class
 # ==============================================================================
 
+def dump_json_bytes(obj, default=None) -> bytes:
+    """Serialize to indented JSON bytes, via orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=default,
+                            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=default, indent=2).encode('utf-8')
+
+def load_json_bytes(data: bytes):
+    """Deserialize JSON bytes, via orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _flatten_legacy_notifications(loaded: dict) -> Set[Tuple[int, str, str]]:
+    """Convert the old per-guild/per-type nested layout to flat triples"""
+    return {(int(gid), cid, typ)
+            for gid, per_type in loaded.items()
+            for typ, cids in per_type.items()
+            for cid in cids}
+
 class CTFDataManager:
     """Handles all persistent data for the CTF Sentinel Bot"""
     def __init__(self):
         self.ctf_cache = {}
-        self.guild_configs = {}
-        self.sent_notifications = {}
-        self.guild_ctf_status = {}
-
-    def save_all(self):
-        """Save all data to their respective JSON files"""
-        self.save_guild_configs()
-        self.save_sent_notifications()
-        self.save_guild_ctf_status()
-        self.save_ctf_cache()
+        self.guild_configs = defaultdict(default_guild_config)
+        # Flat (guild_id, ctf_id, notification_type) triples: one hash probe
+        # per membership check instead of nested dict/set lookups
+        self.sent_notifications: Set[Tuple[int, str, str]] = set()
+        self.guild_ctf_status = defaultdict(dict)
+        # Guilds with setup_complete, maintained incrementally so the
+        # notification tick never rescans guild_configs
+        self.setup_guilds: Set[int] = set()
+        self._dirty: Set[str] = set()
+        # Digest of the last CTFTime response body; not persisted
+        self._last_fetch_digest: Optional[bytes] = None
+
+    def save_all(self, filename='state.json'):
+        """Write one atomic snapshot of all persistent data, if anything changed"""
+        if not self._dirty:
+            return
+        snapshot = {
+            'configs': self.guild_configs,
+            'notifs': self.sent_notifications,
+            'status': self.guild_ctf_status,
+            'cache': self.ctf_cache,
+        }
+        tmp_filename = filename + '.tmp'
+        with open(tmp_filename, 'wb') as f:
+            # default=list converts the sent_notifications set inside the
+            # serializer walk; no intermediate Python structure is built
+            f.write(dump_json_bytes(snapshot, default=list))
+        os.replace(tmp_filename, filename)
+        self._dirty.clear()
         log_message("💾 All persistent data saved")
 
     def load_all(self):
-        """Load all data from JSON files"""
-        self.load_guild_configs()
-        self.load_sent_notifications()
-        self.load_guild_ctf_status()
-        self.load_ctf_cache()
+        """Load all data, preferring the unified snapshot over legacy per-type files"""
+        if os.path.exists('state.json'):
+            self.load_state()
+        else:
+            self.load_guild_configs()
+            self.load_sent_notifications()
+            self.load_guild_ctf_status()
+        self.load_ctf_cache()  # rewritten on every fetch, so it supersedes the snapshot copy
+        for event in self.ctf_cache.values():
+            annotate_event_timestamps(event)
         log_message("📂 All persistent data loaded")
 
-    def save_guild_configs(self, filename='guild_configs.json'):
-        serializable_configs = {str(gid): cfg for gid, cfg in self.guild_configs.items()}
-        with open(filename, 'w') as f:
-            json.dump(serializable_configs, f, indent=2)
+    def load_state(self, filename='state.json'):
+        with open(filename, 'rb') as f:
+            snapshot = load_json_bytes(f.read())
+        self.guild_configs = defaultdict(default_guild_config,
+                                         {int(gid): cfg for gid, cfg in snapshot.get('configs', {}).items()})
+        self._rebuild_setup_guilds()
+        notifs = snapshot.get('notifs', [])
+        if isinstance(notifs, dict):  # snapshot written before the flat layout
+            self.sent_notifications = _flatten_legacy_notifications(notifs)
+        else:
+            self.sent_notifications = {(int(gid), cid, typ) for gid, cid, typ in notifs}
+        self.guild_ctf_status = defaultdict(dict,
+                                            {int(gid): data for gid, data in snapshot.get('status', {}).items()})
+        self.ctf_cache = snapshot.get('cache', {})
 
     def load_guild_configs(self, filename='guild_configs.json'):
         if os.path.exists(filename):
-            with open(filename, 'r') as f:
-                loaded = json.load(f)
-                self.guild_configs = {int(gid): cfg for gid, cfg in loaded.items()}
+            with open(filename, 'rb') as f:
+                loaded = load_json_bytes(f.read())
+                self.guild_configs = defaultdict(default_guild_config,
+                                                 {int(gid): cfg for gid, cfg in loaded.items()})
+                self._rebuild_setup_guilds()
 
-    def save_sent_notifications(self, filename='sent_notifications.json'):
-        serializable_notifs = {str(gid): {k: list(v) for k, v in data.items()} 
-                             for gid, data in self.sent_notifications.items()}
-        with open(filename, 'w') as f:
-            json.dump(serializable_notifs, f, indent=2)
+    def _rebuild_setup_guilds(self):
+        self.setup_guilds = {gid for gid, cfg in self.guild_configs.items()
+                             if cfg.get('setup_complete')}
 
     def load_sent_notifications(self, filename='sent_notifications.json'):
         if os.path.exists(filename):
-            with open(filename, 'r') as f:
-                loaded = json.load(f)
-                self.sent_notifications = {int(gid): {k: set(v) for k, v in data.items()} 
-                                        for gid, data in loaded.items()}
-
-    def save_guild_ctf_status(self, filename='guild_ctf_status.json'):
-        serializable_status = {str(gid): data for gid, data in self.guild_ctf_status.items()}
-        with open(filename, 'w') as f:
-            json.dump(serializable_status, f, indent=2)
+            with open(filename, 'rb') as f:
+                loaded = load_json_bytes(f.read())
+                self.sent_notifications = _flatten_legacy_notifications(loaded)
 
     def load_guild_ctf_status(self, filename='guild_ctf_status.json'):
         if os.path.exists(filename):
-            with open(filename, 'r') as f:
-                loaded = json.load(f)
-                self.guild_ctf_status = {int(gid): data for gid, data in loaded.items()}
-
-    def save_ctf_cache(self, filename='ctf_cache.json'):
+            with open(filename, 'rb') as f:
+                loaded = load_json_bytes(f.read())
+                self.guild_ctf_status = defaultdict(dict,
+                                                    {int(gid): data for gid, data in loaded.items()})
+
+    def save_ctf_cache(self, filename='ctf_cache.msgpack'):
+        # The cache is machine-only (never hand-edited), so it uses msgpack
+        # rather than indented JSON: smaller file, faster encode/decode
         try:
-            with open(filename, 'w') as f:
-                json.dump(self.ctf_cache, f, indent=2)
+            with open(filename, 'wb') as f:
+                f.write(msgpack.packb(self.ctf_cache, use_bin_type=True))
         except Exception as e:
             log_message(f"❌ Error saving ctf_cache: {e}")
 
-    def load_ctf_cache(self, filename='ctf_cache.json'):
-        if os.path.exists(filename):
-            try:
-                with open(filename, 'r') as f:
-                    self.ctf_cache = json.load(f)
-            except Exception as e:
-                log_message(f"❌ Error loading ctf_cache: {e}")
+    def load_ctf_cache(self, filename='ctf_cache.msgpack'):
+        try:
+            if os.path.exists(filename):
+                with open(filename, 'rb') as f:
+                    self.ctf_cache = msgpack.unpackb(f.read(), raw=False)
+            elif os.path.exists('ctf_cache.json'):  # legacy JSON cache
+                with open('ctf_cache.json', 'rb') as f:
+                    self.ctf_cache = load_json_bytes(f.read())
+        except Exception as e:
+            log_message(f"❌ Error loading ctf_cache: {e}")
 
 # Global Data Manager instance
 data_manager = CTFDataManager()
+PASSWORD_SYMBOLS = "!@#$%^&*()-_=+[]{}|;:,.<>?"
+
 def generate_random_password(length=12, include_symbols=True):
     """Generate a random password with specified length and character set"""
-    # Define character sets
-    lowercase = string.ascii_lowercase
-    uppercase = string.ascii_uppercase
-    digits = string.digits
-    symbols = "!@#$%^&*()-_=+[]{}|;:,.<>?" if include_symbols else ""
-    
+    alphabet = string.ascii_letters + string.digits
+    if include_symbols:
+        alphabet += PASSWORD_SYMBOLS
+    alen = len(alphabet)
+    limit = (256 // alen) * alen  # rejection threshold to avoid modulo bias
+
+    # Draw all randomness in bulk instead of one os.urandom syscall per char
+    password = []
+    while len(password) < length:
+        raw = secrets.token_bytes(length * 2)
+        password.extend(alphabet[b % alen] for b in raw if b < limit)
+    del password[length:]
+
     # Ensure at least one character from each set
-    password = [
-        secrets.choice(lowercase),
-        secrets.choice(uppercase),
-        secrets.choice(digits)
-    ]
-    
+    char_classes = [string.ascii_lowercase, string.ascii_uppercase, string.digits]
     if include_symbols:
-        password.append(secrets.choice(symbols))
-    
-    # Fill the rest with random characters from all sets
-    all_chars = lowercase + uppercase + digits + symbols
-    for _ in range(length - len(password)):
-        password.append(secrets.choice(all_chars))
-    
-    # Shuffle to avoid predictable patterns
-    secrets.SystemRandom().shuffle(password)
-    
+        char_classes.append(PASSWORD_SYMBOLS)
+    while True:
+        missing = [cls for cls in char_classes if not any(c in cls for c in password)]
+        if not missing:
+            break
+        for cls in missing:
+            password[secrets.randbelow(length)] = secrets.choice(cls)
+
     return ''.join(password)
 
 def generate_ctf_friendly_password(length=10):
@@ -178,6 +254,18 @@ intents = discord.Intents.default()
 intents.message_content = True
 bot = commands.Bot(command_prefix='!', intents=intents)
 
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+# Shared HTTP session: keep-alive + TLS resumption across CTFTime fetches
+http_session: Optional[aiohttp.ClientSession] = None
+
+async def get_http_session() -> aiohttp.ClientSession:
+    """Return the shared ClientSession, (re)creating it if needed"""
+    global http_session
+    if http_session is None or http_session.closed:
+        http_session = aiohttp.ClientSession(headers={'User-Agent': USER_AGENT})
+    return http_session
+
 # ==============================================================================
 # Logging & Utility Functions
 # ==============================================================================
@@ -187,20 +275,30 @@ def log_message(message: str):
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     print(f"[{timestamp}] {message}")
 
+@functools.lru_cache(maxsize=2048)
 def parse_ctf_time_to_timestamp(time_str: str) -> Optional[int]:
-    """Parse CTF time string and return Unix timestamp (UTC enforced)"""
+    """Parse CTF time string and return Unix timestamp (UTC enforced)
+
+    Memoized: the same ~15 cached CTF records are re-parsed on every
+    notification tick and button click.
+    """
     if not time_str:
         return None
-    time_formats = ["%Y-%m-%dT%H:%M:%S%z", "%Y-%m-%dT%H:%M:%S.%f%z", 
-                    "%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M:%S.%f"]
-    for fmt in time_formats:
-        try:
-            dt = datetime.strptime(time_str, fmt)
-            if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=timezone.utc)
-            return int(dt.timestamp())
-        except ValueError:
-            continue
+    # Pick the format from the string's shape instead of walking a format
+    # list and paying a ValueError round-trip per miss
+    has_frac = '.' in time_str
+    has_tz = time_str.endswith('Z') or ('+' in time_str[19:] or '-' in time_str[19:])
+    if has_frac:
+        fmt = "%Y-%m-%dT%H:%M:%S.%f%z" if has_tz else "%Y-%m-%dT%H:%M:%S.%f"
+    else:
+        fmt = "%Y-%m-%dT%H:%M:%S%z" if has_tz else "%Y-%m-%dT%H:%M:%S"
+    try:
+        dt = datetime.strptime(time_str, fmt)
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return int(dt.timestamp())
+    except ValueError:
+        pass
     try:
         dt = datetime.strptime(time_str[:19], "%Y-%m-%dT%H:%M:%S")
         return int(dt.replace(tzinfo=timezone.utc).timestamp())
@@ -211,10 +309,19 @@ def format_discord_timestamp(timestamp: int, style: str = "f") -> str:
     """Format Unix timestamp as Discord timestamp"""
     return f"<t:{timestamp}:{style}>"
 
+def annotate_event_timestamps(event: dict):
+    """Parse the ISO start/finish strings once and stash Unix timestamps
+
+    Called wherever events enter the cache (API fetch, disk load, test
+    command) so downstream consumers never re-parse the strings.
+    """
+    event['_start_ts'] = parse_ctf_time_to_timestamp(event.get('start', ''))
+    event['_finish_ts'] = parse_ctf_time_to_timestamp(event.get('finish', ''))
+
 def get_ctf_discord_timestamps(event: dict) -> dict:
     """Get Discord-formatted timestamps for a CTF event"""
-    start_ts = parse_ctf_time_to_timestamp(event.get('start', ''))
-    finish_ts = parse_ctf_time_to_timestamp(event.get('finish', ''))
+    start_ts = event.get('_start_ts')
+    finish_ts = event.get('_finish_ts')
     return {
         'start_timestamp': start_ts,
         'finish_timestamp': finish_ts,
@@ -224,10 +331,20 @@ def get_ctf_discord_timestamps(event: dict) -> dict:
         'finish_relative': format_discord_timestamp(finish_ts, 'R') if finish_ts else "Unknown"
     }
 
+# Compiled once at import; runs per CTF event
+_DISCORD_URL = re.compile(r'(?:https://)?(?:discord\.gg|discord\.com/invite)/[A-Za-z0-9]+',
+                          re.IGNORECASE)
+
+# One-pass translation table: delete disallowed ASCII and lowercase A-Z.
+# Whitespace survives the table and is collapsed to dashes by split/join.
+_SANITIZE_TABLE = {ord(c): None for c in map(chr, range(128))
+                   if not (c.isalnum() or c.isspace() or c in '-_')}
+_SANITIZE_TABLE.update({ord(c): ord(c.lower()) for c in string.ascii_uppercase})
+
 def sanitize_channel_name(name: str) -> str:
     """Convert CTF name to valid Discord channel name"""
-    name = re.sub(r'[^a-zA-Z0-9\s\-_]', '', name)
-    name = re.sub(r'\s+', '-', name.strip()).lower()
+    name = name.encode('ascii', 'ignore').decode()  # drop non-ASCII in one pass
+    name = '-'.join(name.translate(_SANITIZE_TABLE).split())
     if name and not name[0].isalnum():
         name = 'ctf-' + name
     return name[:100] if name else 'ctf-channel'
@@ -236,24 +353,19 @@ def extract_discord_link_from_description(event: dict) -> Optional[str]:
     """Extract Discord invite link from CTF description if available"""
     description = event.get('description', '')
     if not description: return None
-    discord_patterns = [r'https://discord\.gg/[A-Za-z0-9]+', 
-                        r'https://discord\.com/invite/[A-Za-z0-9]+',
-                        r'discord\.gg/[A-Za-z0-9]+', 
-                        r'discord\.com/invite/[A-Za-z0-9]+']
-    for pattern in discord_patterns:
-        match = re.search(pattern, description, re.IGNORECASE)
-        if match:
-            url = match.group(0)
-            return url if url.startswith('https://') else 'https://' + url
+    match = _DISCORD_URL.search(description)
+    if match:
+        url = match.group(0)
+        return url if url.startswith('https://') else 'https://' + url
     return None
 
 # ==============================================================================
 # Helper Functions & Utilities
 # ==============================================================================
 
-def get_setup_guilds() -> List[int]:
-    """Get list of guilds that have completed setup"""
-    return [int(gid) for gid, cfg in data_manager.guild_configs.items() if cfg.get("setup_complete")]
+def get_setup_guilds() -> Set[int]:
+    """Get the guilds that have completed setup"""
+    return data_manager.setup_guilds
 
 def user_has_ctf_permissions(user: discord.Member, guild_id: int) -> bool:
     """Check if user has permission to manage CTFs"""
@@ -268,41 +380,17 @@ def get_ctf_id(event: dict) -> str:
     eid = event.get('id', 'unk')
     return f"{title}_{eid}"
 
-def get_guild_notifications(guild_id: int) -> dict:
-    """Get notification tracking for a specific guild"""
-    if guild_id not in data_manager.sent_notifications:
-        data_manager.sent_notifications[guild_id] = {
-            '24h': set(),
-            '1h': set(), 
-            'channel_1h': set(),
-            'archived': set(),
-            'test': set(),  # For test notifications
-        }
-    # Ensure 'test' key exists for legacy data
-    if 'test' not in data_manager.sent_notifications[guild_id]:
-        data_manager.sent_notifications[guild_id]['test'] = set()
-    return data_manager.sent_notifications[guild_id]
-
 def has_notification_been_sent(guild_id: int, ctf_id: str, notification_type: str) -> bool:
     """Check if a notification has been sent for a specific guild"""
-    guild_notifications = get_guild_notifications(guild_id)
-    return ctf_id in guild_notifications[notification_type]
+    return (guild_id, ctf_id, notification_type) in data_manager.sent_notifications
 
 def mark_notification_sent(guild_id: int, ctf_id: str, notification_type: str):
     """Mark a notification as sent for a specific guild"""
-    guild_notifications = get_guild_notifications(guild_id)
-    guild_notifications[notification_type].add(ctf_id)
+    data_manager.sent_notifications.add((guild_id, ctf_id, notification_type))
+    data_manager._dirty.add('notifs')
 
 def get_guild_config(guild_id: int) -> dict:
     """Get guild configuration with default values"""
-    if guild_id not in data_manager.guild_configs:
-        data_manager.guild_configs[guild_id] = {
-            "setup_complete": False,
-            "channel_id": None,
-            "settings": DEFAULT_CONFIG.copy(),
-            "ctf_channels": {},
-            "ctf_credentials": DEFAULT_CTF_CREDENTIALS.copy()
-        }
     return data_manager.guild_configs[guild_id]
 
 def is_guild_setup_complete(guild_id: int) -> bool:
@@ -320,6 +408,8 @@ def set_guild_channel_id(guild_id: int, channel_id: int):
     config = get_guild_config(guild_id)
     config["channel_id"] = channel_id
     config["setup_complete"] = True
+    data_manager.setup_guilds.add(guild_id)
+    data_manager._dirty.add('configs')
     log_message(f"✅ Guild {guild_id} setup completed with channel {channel_id}")
 
 def get_guild_setting(guild_id: int, setting: str):
@@ -331,6 +421,7 @@ def set_guild_setting(guild_id: int, setting: str, value):
     """Set a specific setting for a guild"""
     config = get_guild_config(guild_id)
     config["settings"][setting] = value
+    data_manager._dirty.add('configs')
     log_message(f"🔧 Guild {guild_id} setting '{setting}' set to {value}")
 
 def get_guild_credentials(guild_id: int) -> dict:
@@ -342,12 +433,14 @@ def set_guild_credentials(guild_id: int, credentials: dict):
     """Set CTF credentials for a guild"""
     config = get_guild_config(guild_id)
     config["ctf_credentials"] = credentials
+    data_manager._dirty.add('configs')
     log_message(f"🔧 Guild {guild_id} CTF credentials updated")
 
 def register_ctf_channel(guild_id: int, ctf_id: str, channel_id: int):
     """Register a CTF channel for tracking"""
     config = get_guild_config(guild_id)
     config["ctf_channels"][ctf_id] = channel_id
+    data_manager._dirty.add('configs')
 
 def get_ctf_channel(guild_id: int, ctf_id: str) -> Optional[int]:
     """Get CTF channel ID"""
@@ -356,8 +449,6 @@ def get_ctf_channel(guild_id: int, ctf_id: str) -> Optional[int]:
 
 def get_guild_ctf_status(guild_id: int) -> dict:
     """Get CTF status tracking for a specific guild"""
-    if guild_id not in data_manager.guild_ctf_status:
-        data_manager.guild_ctf_status[guild_id] = {}
     return data_manager.guild_ctf_status[guild_id]
 
 def is_ctf_joined(guild_id: int, ctf_id: str) -> bool:
@@ -379,6 +470,7 @@ def mark_ctf_joined(guild_id: int, ctf_id: str):
     guild_status[ctf_id]['joined'] = True
     guild_status[ctf_id]['skipped'] = False
     guild_status[ctf_id].pop('skip_until', None)
+    data_manager._dirty.add('status')
     log_message(f"✅ CTF {ctf_id} marked as joined for guild {guild_id}")
 
 def mark_ctf_skipped(guild_id: int, ctf_id: str):
@@ -389,6 +481,7 @@ def mark_ctf_skipped(guild_id: int, ctf_id: str):
     guild_status[ctf_id]['skipped'] = True
     guild_status[ctf_id]['joined'] = False
     guild_status[ctf_id].pop('skip_until', None)
+    data_manager._dirty.add('status')
     log_message(f"⏭️ CTF {ctf_id} marked as permanently skipped for guild {guild_id}")
 
 def should_send_notification(guild_id: int, ctf_id: str) -> bool:
@@ -401,23 +494,20 @@ def should_send_notification(guild_id: int, ctf_id: str) -> bool:
 # Interaction Views
 # ==============================================================================
 
-class CTFActionButtons(discord.ui.View):
+class JoinCTFButton(discord.ui.DynamicItem[discord.ui.Button],
+                    template=r'ctf:join:(?P<ctf_id>.+)'):
+    """Persistent Join button; the CTF ID lives in the custom_id"""
     def __init__(self, ctf_id: str):
-        super().__init__(timeout=None)
+        super().__init__(discord.ui.Button(label='Join CTF', style=discord.ButtonStyle.green,
+                                           emoji='🚩', custom_id=f'ctf:join:{ctf_id}'))
         self.ctf_id = ctf_id
-        
-        # Set deterministic custom_ids for persistence
-        self.join_ctf.custom_id = f"ctf:join:{ctf_id}"
-        self.show_info.custom_id = f"ctf:info:{ctf_id}"
-        self.skip_ctf.custom_id = f"ctf:skip:{ctf_id}"
-    
-    async def get_event_data(self):
-        """Fetch event data from data manager cache"""
-        return data_manager.ctf_cache.get(self.ctf_id)
 
-    @discord.ui.button(label='Join CTF', style=discord.ButtonStyle.green, emoji='🚩')
-    async def join_ctf(self, interaction: discord.Interaction, button: discord.ui.Button):
-        event_data = await self.get_event_data()
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(match['ctf_id'])
+
+    async def callback(self, interaction: discord.Interaction):
+        event_data = data_manager.ctf_cache.get(self.ctf_id)
         if not event_data:
             await interaction.response.send_message("❌ CTF data not found (expired or cleared).", ephemeral=True)
             return
@@ -426,60 +516,73 @@ class CTFActionButtons(discord.ui.View):
         if not user_has_ctf_permissions(interaction.user, interaction.guild.id):
             await interaction.response.send_message("❌ You don't have permission to join CTFs.", ephemeral=True)
             return
-        
+
         await interaction.response.defer(ephemeral=True)
-        
+
         try:
             guild = interaction.guild
+            cfg = get_guild_config(guild.id)
             category = await get_or_create_category(guild, CTF_CATEGORY_NAME)
             channel_name = sanitize_channel_name(event_data['title'])
-            
+
             existing_channel = discord.utils.get(guild.text_channels, name=channel_name)
             if existing_channel:
                 await interaction.followup.send(f"✅ CTF channel already exists: {existing_channel.mention}", ephemeral=True)
                 mark_ctf_joined(guild.id, self.ctf_id)
                 return
-            
+
             # Create channel
             channel = await guild.create_text_channel(
                 name=channel_name,
                 category=category,
                 topic=f"CTF: {event_data['title']} | {event_data.get('url', 'No URL')}"
             )
-            
+
             # Register and update status
-            get_guild_config(guild.id)["ctf_channels"][self.ctf_id] = channel.id
+            cfg["ctf_channels"][self.ctf_id] = channel.id
+            data_manager._dirty.add('configs')
             mark_ctf_joined(guild.id, self.ctf_id)
-            
+
             # Post credentials
-            credentials = get_guild_config(guild.id).get("ctf_credentials", DEFAULT_CTF_CREDENTIALS)
+            credentials = cfg.get("ctf_credentials", DEFAULT_CTF_CREDENTIALS)
             ctf_password = generate_random_password(12)
             ts = get_ctf_discord_timestamps(event_data)
-            
+
             embed = discord.Embed(title=f"🚩 {event_data['title']} - Login Details", color=discord.Color.green())
             embed.description = (f"**Website:** {event_data.get('url', 'N/A')}\n"
                                 f"**User:** `{credentials['user']}`\n"
                                 f"**Pass:** `{ctf_password}`\n"
                                 f"**Email:** `{credentials['email']}`")
-            
+
             discord_link = extract_discord_link_from_description(event_data)
             if discord_link:
                 embed.description += f"\n**Discord:** {discord_link}"
-                
+
             embed.add_field(name="📅 Start", value=ts['start_relative'], inline=True)
             embed.add_field(name="🏁 End", value=ts['finish_relative'], inline=True)
-            
+
             await channel.send(content="@everyone", embed=embed)
             await interaction.followup.send(f"✅ Created channel: {channel.mention}", ephemeral=True)
             log_message(f"✅ Channel #{channel.name} created for {event_data['title']}")
-            
+
         except Exception as e:
             log_message(f"❌ Error in join_ctf: {e}")
             await interaction.followup.send(f"❌ Error creating channel: {str(e)}", ephemeral=True)
 
-    @discord.ui.button(label='More Info', style=discord.ButtonStyle.primary, emoji='ℹ️')
-    async def show_info(self, interaction: discord.Interaction, button: discord.ui.Button):
-        event_data = await self.get_event_data()
+class ShowInfoButton(discord.ui.DynamicItem[discord.ui.Button],
+                     template=r'ctf:info:(?P<ctf_id>.+)'):
+    """Persistent More Info button"""
+    def __init__(self, ctf_id: str):
+        super().__init__(discord.ui.Button(label='More Info', style=discord.ButtonStyle.primary,
+                                           emoji='ℹ️', custom_id=f'ctf:info:{ctf_id}'))
+        self.ctf_id = ctf_id
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(match['ctf_id'])
+
+    async def callback(self, interaction: discord.Interaction):
+        event_data = data_manager.ctf_cache.get(self.ctf_id)
         if not event_data:
             await interaction.response.send_message("❌ CTF data not found.", ephemeral=True)
             return
@@ -491,14 +594,34 @@ class CTFActionButtons(discord.ui.View):
         embed.add_field(name="🏁 End", value=ts['finish_discord'], inline=True)
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
-    @discord.ui.button(label='Skip', style=discord.ButtonStyle.secondary, emoji='⏭️')
-    async def skip_ctf(self, interaction: discord.Interaction, button: discord.ui.Button):
+class SkipCTFButton(discord.ui.DynamicItem[discord.ui.Button],
+                    template=r'ctf:skip:(?P<ctf_id>.+)'):
+    """Persistent Skip button"""
+    def __init__(self, ctf_id: str):
+        super().__init__(discord.ui.Button(label='Skip', style=discord.ButtonStyle.secondary,
+                                           emoji='⏭️', custom_id=f'ctf:skip:{ctf_id}'))
+        self.ctf_id = ctf_id
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(match['ctf_id'])
+
+    async def callback(self, interaction: discord.Interaction):
         if not user_has_ctf_permissions(interaction.user, interaction.guild.id):
             await interaction.response.send_message("❌ Admin permissions required.", ephemeral=True)
             return
         mark_ctf_skipped(interaction.guild.id, self.ctf_id)
         await interaction.response.send_message(f"✅ Permanently skipped **{self.ctf_id}**.", ephemeral=True)
 
+class CTFActionButtons(discord.ui.View):
+    """View attached to outgoing notifications; dispatch after restart is
+    handled by the dynamic items above, not by re-registering views"""
+    def __init__(self, ctf_id: str):
+        super().__init__(timeout=None)
+        self.add_item(JoinCTFButton(ctf_id))
+        self.add_item(ShowInfoButton(ctf_id))
+        self.add_item(SkipCTFButton(ctf_id))
+
 async def get_or_create_category(guild: discord.Guild, category_name: str):
     """Utility to find or build a category"""
     category = discord.utils.get(guild.categories, name=category_name)
@@ -511,19 +634,6 @@ async def get_or_create_category(guild: discord.Guild, category_name: str):
         log_message(f"❌ Category error: {e}")
         return None
 
-def user_has_ctf_permissions(user: discord.Member, guild_id: int) -> bool:
-    """Check if user has permission to manage CTFs"""
-    if user.guild_permissions.administrator: return True
-    admin_roles = get_guild_setting(guild_id, "admin_roles")
-    if not admin_roles: return False
-    return any(role.id in admin_roles for role in user.roles)
-
-def get_ctf_id(event: dict) -> str:
-    """Standardized ID generation for CTFs"""
-    title = event.get('title', 'ctf')
-    eid = event.get('id', 'unk')
-    return f"{title}_{eid}"
-
 # ==============================================================================
 # Notification Utilities
 # ==============================================================================
@@ -535,11 +645,19 @@ async def send_ctf_channel_reminder(guild_id: int, ctf_id: str, event: dict):
     
     channel = bot.get_channel(channel_id)
     if not channel: return False
-    
-    ts = get_ctf_discord_timestamps(event)
-    embed = discord.Embed(title="🚨 Reminder: CTF Starting Soon!", color=discord.Color.red())
-    embed.description = f"**{event['title']}** starts {ts['start_relative']}!"
-    
+
+    # Embed content depends only on event fields (Discord renders <t:..:R>
+    # client-side), so the serialized dict is built once and shared by every
+    # guild tracking the same event
+    embed_dict = event.get('_embed_reminder')
+    if embed_dict is None:
+        ts = get_ctf_discord_timestamps(event)
+        embed = discord.Embed(title="🚨 Reminder: CTF Starting Soon!", color=discord.Color.red())
+        embed.description = f"**{event['title']}** starts {ts['start_relative']}!"
+        event['_embed_reminder'] = embed_dict = embed.to_dict()
+    else:
+        embed = discord.Embed.from_dict(embed_dict)
+
     await channel.send(content="@everyone", embed=embed)
     log_message(f"🚨 Sent channel reminder for {event['title']}")
     return True
@@ -550,64 +668,87 @@ async def send_ctf_channel_reminder(guild_id: int, ctf_id: str, event: dict):
 
 async def fetch_and_cache_ctfs():
     """Fetch upcoming CTFs from CTFTime and cache them"""
-    headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
     start_time = int(datetime.now().timestamp())
     end_time = int((datetime.now() + timedelta(days=10)).timestamp())
     url = f"https://ctftime.org/api/v1/events/?limit=15&start={start_time}&finish={end_time}"
-    
+
     try:
-        response = requests.get(url, headers=headers, timeout=10)
-        if response.status_code == 200:
-            events = response.json()
-            new_cache = {get_ctf_id(e): e for e in events}
-            
-            # Preserve test CTFs that haven't expired yet
-            now = datetime.now(timezone.utc)
-            for cid, event in list(data_manager.ctf_cache.items()):
-                if cid.startswith('test_'):
-                    finish_ts = parse_ctf_time_to_timestamp(event.get('finish'))
-                    if finish_ts:
-                        finish_dt = datetime.fromtimestamp(finish_ts, timezone.utc)
-                        if finish_dt > now:  # Still active
-                            new_cache[cid] = event
-            
-            data_manager.ctf_cache = new_cache
-            data_manager.save_ctf_cache()
-            log_message(f"✅ Fetched {len(events)} CTFs from API")
+        session = await get_http_session()
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
+            if response.status != 200:
+                return False
+            body = await response.read()
+
+        # Identical response to the previous tick: nothing to rebuild or
+        # rewrite (unless an expired test CTF still needs pruning)
+        body_digest = hashlib.blake2b(body, digest_size=16).digest()
+        if (body_digest == data_manager._last_fetch_digest
+                and not any(cid.startswith('test_') for cid in data_manager.ctf_cache)):
+            log_message("✅ CTF list unchanged since last fetch")
             return True
+
+        events = load_json_bytes(body)
+        for e in events:
+            annotate_event_timestamps(e)
+        new_cache = {get_ctf_id(e): e for e in events}
+
+        # Preserve test CTFs that haven't expired yet
+        now_ts = int(time.time())
+        for cid, event in list(data_manager.ctf_cache.items()):
+            if cid.startswith('test_'):
+                finish_ts = event.get('_finish_ts')
+                if finish_ts and finish_ts > now_ts:  # Still active
+                    new_cache[cid] = event
+
+        data_manager.ctf_cache = new_cache
+        data_manager._last_fetch_digest = body_digest
+        data_manager._dirty.add('cache')
+        await asyncio.to_thread(data_manager.save_ctf_cache)
+        log_message(f"✅ Fetched {len(events)} CTFs from API")
+        return True
     except Exception as e:
         log_message(f"❌ API fetch error: {e}")
     return False
 
 async def check_notification_triggers():
     """Check and send notifications for all set up guilds"""
-    now = datetime.now(timezone.utc)
+    now_ts = int(time.time())
+
+    # Classify every cached CTF against the notification windows once per
+    # tick; the per-guild loop then only visits CTFs that can actually fire
+    active = []
+    for cid, event in data_manager.ctf_cache.items():
+        start_ts = event.get('_start_ts')
+        if not start_ts: continue
+        hours_until = (start_ts - now_ts) / 3600.0
+        in_24h_window = 23 <= hours_until <= 25
+        in_1h_window = 0 < hours_until <= 1.5
+        if in_24h_window or in_1h_window:
+            active.append((cid, event, in_24h_window, in_1h_window))
+
+    if not active:
+        return
+
     for gid in get_setup_guilds():
         guild = bot.get_guild(gid)
         if not guild: continue
-        
-        for cid, event in data_manager.ctf_cache.items():
-            start_ts = parse_ctf_time_to_timestamp(event.get('start'))
-            if not start_ts: continue
-            
-            start_dt = datetime.fromtimestamp(start_ts, timezone.utc)
-            hours_until = (start_dt - now).total_seconds() / 3600
-            
+
+        for cid, event, in_24h_window, in_1h_window in active:
             if not should_send_notification(gid, cid):
                 # If joined, check for 1h channel reminder
-                if is_ctf_joined(gid, cid) and 0 < hours_until <= 1.5:
+                if in_1h_window and is_ctf_joined(gid, cid):
                     if not has_notification_been_sent(gid, cid, 'channel_1h'):
                         if await send_ctf_channel_reminder(gid, cid, event):
                             mark_notification_sent(gid, cid, 'channel_1h')
                 continue
-            
+
             # 24h notification
-            if 23 <= hours_until <= 25 and get_guild_setting(gid, 'notification_24h'):
+            if in_24h_window and get_guild_setting(gid, 'notification_24h'):
                 if not has_notification_been_sent(gid, cid, '24h'):
                     await send_guild_notification(gid, cid, event, '24h')
-            
+
             # 1h notification
-            elif 0 < hours_until <= 1.5 and get_guild_setting(gid, 'notification_1h'):
+            elif in_1h_window and get_guild_setting(gid, 'notification_1h'):
                 if not has_notification_been_sent(gid, cid, '1h'):
                     await send_guild_notification(gid, cid, event, '1h')
 
@@ -618,14 +759,22 @@ async def send_guild_notification(guild_id: int, ctf_id: str, event: dict, type:
     
     channel = bot.get_channel(channel_id)
     if not channel: return
-    
-    ts = get_ctf_discord_timestamps(event)
-    color = discord.Color.orange() if type == '24h' else discord.Color.red()
-    embed = discord.Embed(title=f"🚩 {event['title']}", color=color, url=event.get('url', ''))
-    embed.description = f"**Starting {ts['start_relative']}**\n\n{event.get('description', '')[:300]}..."
-    embed.add_field(name="📅 Start", value=ts['start_discord'], inline=True)
-    embed.set_footer(text=f"CTF Sentinel • {type.upper()} Alert")
-    
+
+    # Same sharing trick as send_ctf_channel_reminder: build and serialize
+    # the alert embed once per (event, type), reuse it for every guild
+    embed_key = f'_embed_{type}'
+    embed_dict = event.get(embed_key)
+    if embed_dict is None:
+        ts = get_ctf_discord_timestamps(event)
+        color = discord.Color.orange() if type == '24h' else discord.Color.red()
+        embed = discord.Embed(title=f"🚩 {event['title']}", color=color, url=event.get('url', ''))
+        embed.description = f"**Starting {ts['start_relative']}**\n\n{event.get('description', '')[:300]}..."
+        embed.add_field(name="📅 Start", value=ts['start_discord'], inline=True)
+        embed.set_footer(text=f"CTF Sentinel • {type.upper()} Alert")
+        event[embed_key] = embed_dict = embed.to_dict()
+    else:
+        embed = discord.Embed.from_dict(embed_dict)
+
     await channel.send(embed=embed, view=CTFActionButtons(ctf_id))
     mark_notification_sent(guild_id, ctf_id, type)
     log_message(f"📡 Sent {type} notification for {event['title']} to {channel.name}")
@@ -640,12 +789,15 @@ async def notification_check_task():
 
 @tasks.loop(minutes=30)
 async def auto_save_task():
-    data_manager.save_all()
+    # save_all is also dirty-gated; checking here skips the thread hop
+    # entirely on an idle interval
+    if data_manager._dirty:
+        await asyncio.to_thread(data_manager.save_all)
 
 @tasks.loop(minutes=5)
 async def archive_channels_task():
     """Background task to move finished CTF channels to archive category"""
-    now = datetime.now(timezone.utc)
+    now_ts = int(time.time())
     for gid in get_setup_guilds():
         guild = bot.get_guild(gid)
         if not guild: continue
@@ -665,11 +817,10 @@ async def archive_channels_task():
             event = data_manager.ctf_cache.get(cid)
             if not event: continue
             
-            finish_ts = parse_ctf_time_to_timestamp(event.get('finish'))
+            finish_ts = event.get('_finish_ts')
             if not finish_ts: continue
-            
-            finish_dt = datetime.fromtimestamp(finish_ts, timezone.utc)
-            mins_since_finish = (now - finish_dt).total_seconds() / 60
+
+            mins_since_finish = (now_ts - finish_ts) / 60.0
             
             if mins_since_finish >= delay_mins:
                 channel = guild.get_channel(channel_id)
@@ -700,10 +851,11 @@ async def on_ready():
     # Load persistent data
     data_manager.load_all()
     
-    # Restore persistent views
-    for cid in data_manager.ctf_cache:
-        bot.add_view(CTFActionButtons(cid))
-    
+    # Register the dynamic button classes once; old messages dispatch by
+    # custom_id pattern, so no per-CTF view registration is needed
+    bot.add_dynamic_items(JoinCTFButton, ShowInfoButton, SkipCTFButton)
+
+
     # Start background tasks
     api_fetch_task.start()
     notification_check_task.start()
@@ -718,7 +870,9 @@ async def on_guild_join(guild: discord.Guild):
 # Graceful shutdown
 async def shutdown():
     log_message("🛑 Saving data before shutdown...")
-    data_manager.save_all()
+    await asyncio.to_thread(data_manager.save_all)
+    if http_session is not None and not http_session.closed:
+        await http_session.close()
     await bot.close()
 
 def signal_handler(sig, frame):
@@ -778,7 +932,8 @@ async def slash_bot_settings(interaction: discord.Interaction,
 @app_commands.default_permissions(administrator=True)
 async def slash_reset_notifications(interaction: discord.Interaction):
     gid = interaction.guild.id
-    data_manager.sent_notifications[gid] = {"24h": set(), "1h": set(), "channel_1h": set(), "archived": set()}
+    data_manager.sent_notifications = {t for t in data_manager.sent_notifications if t[0] != gid}
+    data_manager._dirty.add('notifs')
     await interaction.response.send_message("🔄 Notification history reset.", ephemeral=True)
 
 @bot.tree.command(name="ctf_reset_status", description="Clear all CTF join/skip statuses")
@@ -786,6 +941,7 @@ async def slash_reset_notifications(interaction: discord.Interaction):
 async def slash_reset_status(interaction: discord.Interaction):
     gid = interaction.guild.id
     data_manager.guild_ctf_status[gid] = {}
+    data_manager._dirty.add('status')
     await interaction.response.send_message("🔄 All CTF statuses (joined/skipped) have been reset.", ephemeral=True)
 
 @bot.tree.command(name="ctf_test_notification", description="Send a test notification to verify setup")
@@ -813,10 +969,12 @@ async def slash_test_notification(interaction: discord.Interaction):
         'finish': (datetime.now(timezone.utc) + timedelta(minutes=5)).isoformat(),
         'id': 'test'
     }
-    
+    annotate_event_timestamps(test_event)
+
     # Add to cache so buttons work
     data_manager.ctf_cache[test_id] = test_event
-    data_manager.save_ctf_cache()
+    data_manager._dirty.add('cache')
+    await asyncio.to_thread(data_manager.save_ctf_cache)
     
     await send_guild_notification(interaction.guild.id, test_id, test_event, "test")
 